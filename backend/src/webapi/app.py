@@ -1,16 +1,24 @@
 """FastAPI application for news analysis and heatmap generation."""
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.inmemory import InMemoryBackend
+from fastapi_cache.backends.redis import RedisBackend
+from fastapi_cache.decorator import cache
+from redis import asyncio as aioredis
 import uvicorn
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 import asyncio
 import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
 
 from .services.news_service import NewsService
 from .services.heatmap_service import HeatmapService
-from .models.news_models import NewsHeatmapResponse, NewsArticle
+from .models.news_models import NewsHeatmapResponse, NewsArticlesResponse, NewsArticle
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -35,6 +43,172 @@ app.add_middleware(
 news_service = NewsService()
 heatmap_service = HeatmapService()
 
+# Cached responses live as long as the underlying news cache
+RESPONSE_CACHE_EXPIRE = int(news_service.cache_duration.total_seconds())
+
+# Background heatmap precomputation for the default query
+DEFAULT_HEATMAP_LIMIT = 50
+HEATMAP_REFRESH_INTERVAL = 600  # 10 minutes
+HEATMAP_REFRESH_EXPIRE = 2 * HEATMAP_REFRESH_INTERVAL
+HEATMAP_CACHE_NAMESPACE = "heatmap"
+
+_heatmap_refresher_task: Optional[asyncio.Task] = None
+
+# In-flight heatmap generations keyed by (sectors, limit)
+_inflight_heatmaps: Dict[tuple, asyncio.Task] = {}
+
+def _heatmap_key_builder(
+    func: Callable[..., Any],
+    namespace: str = "",
+    *,
+    args: tuple = (),
+    kwargs: Optional[Dict[str, Any]] = None,
+    **_: Any
+) -> str:
+    """
+    Build the heatmap cache key from the sectors and limit query params.
+    
+    Shared by the heatmap endpoint and the refresher. The key is built from
+    the cache prefix and HEATMAP_CACHE_NAMESPACE rather than the namespace
+    fastapi-cache passes in, so both produce the same key.
+    """
+    kwargs = kwargs or {}
+    return (
+        f"{FastAPICache.get_prefix()}:{HEATMAP_CACHE_NAMESPACE}:"
+        f"{kwargs.get('sectors')}:{kwargs.get('limit')}"
+    )
+
+def _articles_key_builder(
+    func: Callable[..., Any],
+    namespace: str = "",
+    *,
+    args: tuple = (),
+    kwargs: Optional[Dict[str, Any]] = None,
+    **_: Any
+) -> str:
+    """Build the articles cache key from the limit query param."""
+    kwargs = kwargs or {}
+    return f"{namespace}:{kwargs.get('limit')}"
+
+@app.on_event("startup")
+async def init_response_cache():
+    """Initialize the response cache, backed by Redis when REDIS_URL is set."""
+    redis_url = os.getenv("REDIS_URL")
+    if redis_url:
+        backend = RedisBackend(aioredis.from_url(redis_url))
+    else:
+        logger.warning("REDIS_URL not set, using in-memory response cache")
+        backend = InMemoryBackend()
+    FastAPICache.init(backend, prefix="news-api")
+
+def _create_heatmap_executor() -> ProcessPoolExecutor:
+    """Create the process pool used for CPU-bound heatmap generation."""
+    # Spawn rather than fork so workers don't inherit the event loop's threads
+    return ProcessPoolExecutor(
+        max_workers=os.cpu_count(),
+        mp_context=multiprocessing.get_context("spawn")
+    )
+
+@app.on_event("startup")
+async def start_heatmap_executor():
+    """Start the process pool used for CPU-bound heatmap generation."""
+    heatmap_service.executor_factory = _create_heatmap_executor
+    heatmap_service.executor = _create_heatmap_executor()
+
+@app.on_event("shutdown")
+async def stop_heatmap_executor():
+    """Shut down the heatmap process pool."""
+    heatmap_service.executor_factory = None
+    if heatmap_service.executor:
+        # Wait for the workers in a thread so the event loop isn't blocked
+        executor, heatmap_service.executor = heatmap_service.executor, None
+        await asyncio.to_thread(executor.shutdown, cancel_futures=True)
+
+@app.on_event("startup")
+async def start_heatmap_refresher():
+    """Start precomputing the default heatmap in the background."""
+    global _heatmap_refresher_task
+    _heatmap_refresher_task = asyncio.create_task(_heatmap_refresher())
+
+@app.on_event("shutdown")
+async def stop_heatmap_refresher():
+    """Stop the background heatmap refresher."""
+    if _heatmap_refresher_task:
+        _heatmap_refresher_task.cancel()
+
+@app.on_event("shutdown")
+async def close_news_service():
+    """Close the news service's shared HTTP session."""
+    await news_service.close()
+
+async def _heatmap_refresher():
+    """
+    Periodically regenerate the default heatmap and store it in the response cache.
+    
+    Keeps the default /api/news/heatmap request a pure cache hit, so users never
+    wait for a regeneration after the cached entry expires.
+    """
+    key = _heatmap_key_builder(
+        get_news_heatmap, kwargs={"sectors": None, "limit": DEFAULT_HEATMAP_LIMIT}
+    )
+    while True:
+        try:
+            response = await _coalesced_heatmap_response(None, DEFAULT_HEATMAP_LIMIT)
+            await FastAPICache.get_backend().set(
+                key,
+                FastAPICache.get_coder().encode(response),
+                HEATMAP_REFRESH_EXPIRE
+            )
+            logger.info("Refreshed cached heatmap")
+        except Exception as e:
+            logger.error(f"Error refreshing heatmap: {str(e)}")
+        
+        await asyncio.sleep(HEATMAP_REFRESH_INTERVAL)
+
+async def _coalesced_heatmap_response(
+    sector_list: Optional[List[str]],
+    limit: int
+) -> NewsHeatmapResponse:
+    """
+    Generate the heatmap response once for concurrent identical requests.
+    
+    The first caller starts the generation and later callers with the same
+    sectors and limit await the same task until it completes.
+    """
+    key = (tuple(sector_list) if sector_list else None, limit)
+    task = _inflight_heatmaps.get(key)
+    if task is None:
+        task = asyncio.create_task(_build_heatmap_response(sector_list, limit))
+        _inflight_heatmaps[key] = task
+        task.add_done_callback(lambda _: _inflight_heatmaps.pop(key, None))
+    
+    # Shield so one cancelled request doesn't cancel the shared generation
+    return await asyncio.shield(task)
+
+async def _build_heatmap_response(
+    sector_list: Optional[List[str]],
+    limit: int
+) -> NewsHeatmapResponse:
+    """Fetch news data and generate the heatmap response."""
+    news_data = await news_service.get_article_cores(limit=limit)
+    
+    if not news_data:
+        raise HTTPException(status_code=404, detail="No news data available")
+    
+    heatmap_data = await heatmap_service.generate_heatmap(
+        news_data, 
+        sectors=sector_list,
+        data_version=news_service.get_last_updated()
+    )
+    
+    return NewsHeatmapResponse(
+        success=True,
+        heatmap_data=heatmap_data,
+        total_articles=len(news_data),
+        sectors_analyzed=heatmap_data.get("sectors", []),
+        last_updated=news_service.get_last_updated()
+    )
+
 @app.get("/")
 async def root():
     """Root endpoint."""
@@ -46,9 +220,10 @@ async def health_check():
     return {"status": "healthy", "service": "news-analysis-api"}
 
 @app.get("/api/news/heatmap", response_model=NewsHeatmapResponse)
+@cache(expire=RESPONSE_CACHE_EXPIRE, namespace=HEATMAP_CACHE_NAMESPACE, key_builder=_heatmap_key_builder)
 async def get_news_heatmap(
     sectors: Optional[str] = None,
-    limit: int = 50,
+    limit: int = Query(DEFAULT_HEATMAP_LIMIT, ge=1, le=news_service.max_articles),
     cache_duration: int = 3600  # 1 hour cache
 ):
     """
@@ -70,32 +245,15 @@ async def get_news_heatmap(
         if sectors:
             sector_list = [s.strip() for s in sectors.split(",")]
         
-        # Get news data
-        news_data = await news_service.get_news_data(limit=limit)
-        
-        if not news_data:
-            raise HTTPException(status_code=404, detail="No news data available")
-        
-        # Generate heatmap
-        heatmap_data = await heatmap_service.generate_heatmap(
-            news_data, 
-            sectors=sector_list
-        )
-        
-        return NewsHeatmapResponse(
-            success=True,
-            heatmap_data=heatmap_data,
-            total_articles=len(news_data),
-            sectors_analyzed=heatmap_data.get("sectors", []),
-            last_updated=news_service.get_last_updated()
-        )
+        return await _coalesced_heatmap_response(sector_list, limit)
         
     except Exception as e:
         logger.error(f"Error generating heatmap: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error generating heatmap: {str(e)}")
 
-@app.get("/api/news/articles")
-async def get_news_articles(limit: int = 20):
+@app.get("/api/news/articles", response_model=NewsArticlesResponse)
+@cache(expire=RESPONSE_CACHE_EXPIRE, namespace="articles", key_builder=_articles_key_builder)
+async def get_news_articles(limit: int = Query(20, ge=1, le=news_service.max_articles)):
     """
     Get raw news articles.
     
@@ -103,11 +261,11 @@ async def get_news_articles(limit: int = 20):
         limit: Maximum number of articles to return
     
     Returns:
-        List of news articles
+        NewsArticlesResponse with the articles and their count
     """
     try:
         articles = await news_service.get_news_data(limit=limit)
-        return {"articles": articles, "count": len(articles)}
+        return NewsArticlesResponse(articles=articles, count=len(articles))
     except Exception as e:
         logger.error(f"Error fetching news articles: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error fetching news: {str(e)}")
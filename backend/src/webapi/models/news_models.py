@@ -2,6 +2,7 @@
 
 from pydantic import BaseModel, Field
 from typing import Dict, List, Optional, Any
+from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
 
@@ -25,6 +26,15 @@ class NewsArticle(BaseModel):
     sector: Optional[str] = None
     sector_confidence: Optional[float] = None
 
+@dataclass(slots=True)
+class ArticleCore:
+    """Lightweight article with only the fields used by heatmap generation."""
+    id: str
+    title: str
+    description: str
+    sentiment: Optional[SentimentType] = None
+    relevance_score: Optional[float] = None
+
 class SectorHeatmapData(BaseModel):
     """Model for sector heatmap data."""
     sector: str
@@ -44,6 +54,11 @@ class NewsHeatmapResponse(BaseModel):
     last_updated: Optional[datetime] = None
     error_message: Optional[str] = None
 
+class NewsArticlesResponse(BaseModel):
+    """Response model for raw news articles."""
+    articles: List[NewsArticle]
+    count: int
+
 class NewsAnalysisRequest(BaseModel):
     """Request model for news analysis."""
     sectors: Optional[List[str]] = None
@@ -2,15 +2,71 @@
 
 import re
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable
 from collections import defaultdict, Counter
+from functools import lru_cache
 import asyncio
+from concurrent.futures import Executor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
 
-from ..models.news_models import NewsArticle, SectorHeatmapData, SentimentType
+import ahocorasick
+import numpy as np
+from numba import njit
+
+from ..models.news_models import ArticleCore, SectorHeatmapData, SentimentType
 
 logger = logging.getLogger(__name__)
 
+# Common stop words excluded from sector keywords
+_STOP_WORDS = frozenset({
+    "the", "a", "an", "and", "or", "but", "in", "on", "at", "to", "for", "of", "with", "by",
+    "is", "are", "was", "were", "be", "been", "being", "have", "has", "had", "do", "does", "did",
+    "will", "would", "could", "should", "may", "might", "can", "this", "that", "these", "those",
+    "i", "you", "he", "she", "it", "we", "they", "me", "him", "her", "us", "them"
+})
+
+_WORD_RE = re.compile(r'\b[a-z]{3,}\b')
+
+
+@njit(cache=True)
+def _score_sector_matches(match_offsets, match_ends, match_sector_ids, title_lens, scores):
+    """
+    Accumulate sector scores from keyword matches for a batch of articles.
+    
+    Matches for article i are match_ends[match_offsets[i]:match_offsets[i + 1]]
+    (end offset in the lowercased text) and the matching sector ids. Each match
+    scores 1.0, plus a 2.0 bonus when it lies within the article title.
+    Scores are added into the zeroed (n_articles, n_sectors) scores array.
+    """
+    for i in range(len(title_lens)):
+        for j in range(match_offsets[i], match_offsets[i + 1]):
+            bonus = 2.0 if match_ends[j] < title_lens[i] else 0.0
+            scores[i, match_sector_ids[j]] += 1.0 + bonus
+
+
+# Per-process service used by executor workers
+_worker_service: Optional["HeatmapService"] = None
+
+def _generate_heatmap_sync(
+    article_rows: List[tuple],
+    sectors: Optional[List[str]],
+    data_version: Optional[datetime]
+) -> Dict[str, Any]:
+    """
+    Generate a heatmap in an executor worker process.
+    
+    Module-level so it can be pickled. Articles arrive as
+    (id, title, description, sentiment, relevance_score) tuples.
+    """
+    global _worker_service
+    if _worker_service is None:
+        _worker_service = HeatmapService()
+    
+    articles = [ArticleCore(*row) for row in article_rows]
+    return _worker_service._generate_heatmap(articles, sectors, data_version)
+
+
 class HeatmapService:
     """Service for generating sector-based news heatmaps."""
     
@@ -63,109 +119,177 @@ class HeatmapService:
             SentimentType.NEUTRAL: 0.0,
             SentimentType.NEGATIVE: -1.0
         }
-    
-    def _classify_article_sector(self, article: NewsArticle) -> tuple[str, float]:
-        """
-        Classify an article into a sector based on its content.
         
-        Returns:
-            Tuple of (sector_name, confidence_score)
-        """
-        text = f"{article.title} {article.description}".lower()
-        
-        sector_scores = defaultdict(float)
+        # Integer sector ids used to index the aggregation arrays
+        self._sector_names = list(self.sector_keywords) + ["Other"]
+        self._sector_ids = {name: i for i, name in enumerate(self._sector_names)}
         
+        # Build one Aho-Corasick automaton over every sector keyword so an
+        # article is scanned in a single pass. Some keywords belong to several
+        # sectors (e.g. "insurance"), so each entry maps to all of their ids.
+        keyword_sectors = defaultdict(list)
         for sector, keywords in self.sector_keywords.items():
-            score = 0.0
             for keyword in keywords:
-                # Count keyword occurrences
-                count = text.count(keyword.lower())
-                if count > 0:
-                    # Weight by keyword importance and frequency
-                    score += count * 1.0
-                    
-                    # Bonus for title matches
-                    if keyword.lower() in article.title.lower():
-                        score += 2.0
-            
-            sector_scores[sector] = score
+                keyword_sectors[keyword.lower()].append(self._sector_ids[sector])
         
-        # Find the sector with highest score
-        if not sector_scores:
-            return "Other", 0.0
+        self._ac = ahocorasick.Automaton()
+        for keyword, keyword_sector_ids in keyword_sectors.items():
+            self._ac.add_word(keyword, tuple(keyword_sector_ids))
+        self._ac.make_automaton()
         
-        best_sector = max(sector_scores.items(), key=lambda x: x[1])
+        # Article scans are memoized per article across heatmap calls and
+        # cleared whenever the news data version changes
+        self._scans_by_id = lru_cache(maxsize=1024)(self._scan_article)
+        self._data_version: Optional[datetime] = None
         
-        # Normalize confidence score (0-1)
-        total_score = sum(sector_scores.values())
-        confidence = best_sector[1] / total_score if total_score > 0 else 0.0
+        # Scratch (article x sector) score buffer reused across calls and grown
+        # as needed. Not thread-safe: each process runs one heatmap at a time
+        # (inline on the event loop, or one task per executor worker).
+        self._score_buf = np.zeros((0, len(self.sector_keywords)), dtype=np.float64)
         
-        return best_sector[0], min(confidence, 1.0)
+        # Optional process pool that runs heatmap generation off the event loop,
+        # and the factory used to replace it if a worker dies
+        self.executor: Optional[Executor] = None
+        self.executor_factory: Optional[Callable[[], Executor]] = None
     
-    def _extract_keywords(self, articles: List[NewsArticle], sector: str) -> List[str]:
-        """Extract common keywords from articles in a sector."""
-        all_text = " ".join([
-            f"{article.title} {article.description}" 
-            for article in articles 
-            if self._classify_article_sector(article)[0] == sector
-        ]).lower()
-        
-        # Remove common stop words
-        stop_words = {
-            "the", "a", "an", "and", "or", "but", "in", "on", "at", "to", "for", "of", "with", "by",
-            "is", "are", "was", "were", "be", "been", "being", "have", "has", "had", "do", "does", "did",
-            "will", "would", "could", "should", "may", "might", "can", "this", "that", "these", "those",
-            "i", "you", "he", "she", "it", "we", "they", "me", "him", "her", "us", "them"
-        }
+    def _scan_article(
+        self, article_id: str, title: str, description: str
+    ) -> tuple[np.ndarray, np.ndarray, tuple[str, ...]]:
+        """
+        Scan an article's lowercased title and description once for all downstream uses.
         
-        # Extract words and filter
-        words = re.findall(r'\b[a-z]{3,}\b', all_text)
-        words = [word for word in words if word not in stop_words]
+        Collects the sector keyword matches used for classification and the
+        stop-word-filtered words used for keyword extraction from the same text.
         
-        # Count and return top keywords
-        word_counts = Counter(words)
-        return [word for word, count in word_counts.most_common(10)]
+        Returns:
+            Tuple of (match_ends, match_sector_ids, words)
+        """
+        text = f"{title} {description}"
+        match_ends = []
+        match_sector_ids = []
+        
+        for end, keyword_sector_ids in self._ac.iter(text):
+            for sector_id in keyword_sector_ids:
+                match_ends.append(end)
+                match_sector_ids.append(sector_id)
+        
+        words = tuple(word for word in _WORD_RE.findall(text) if word not in _STOP_WORDS)
+        
+        return (
+            np.array(match_ends, dtype=np.int64),
+            np.array(match_sector_ids, dtype=np.int64),
+            words
+        )
     
-    def _calculate_sentiment_score(self, articles: List[NewsArticle]) -> float:
-        """Calculate average sentiment score for articles (-1 to 1)."""
-        if not articles:
-            return 0.0
+    def _classify_articles(
+        self,
+        scans: List[tuple[np.ndarray, np.ndarray, tuple[str, ...]]],
+        title_lens: List[int]
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Classify scanned articles into sectors.
         
-        total_score = 0.0
-        valid_articles = 0
+        Keyword matches from the Aho-Corasick scans are scored in a single
+        compiled pass over the whole batch. Articles without any keyword
+        match are classified as "Other".
+        
+        Returns:
+            Tuple of (sector_ids, confidence_scores) arrays, one entry per article
+        """
+        n_articles = len(scans)
+        match_offsets = np.zeros(n_articles + 1, dtype=np.int64)
+        np.cumsum([len(scan[0]) for scan in scans], out=match_offsets[1:])
         
-        for article in articles:
-            if article.sentiment:
-                total_score += self.sentiment_weights.get(article.sentiment, 0.0)
-                valid_articles += 1
+        if self._score_buf.shape[0] < n_articles:
+            self._score_buf = np.zeros((n_articles, len(self.sector_keywords)), dtype=np.float64)
+        scores = self._score_buf[:n_articles]
+        scores.fill(0.0)
         
-        return total_score / valid_articles if valid_articles > 0 else 0.0
+        _score_sector_matches(
+            match_offsets,
+            np.concatenate([scan[0] for scan in scans] + [np.empty(0, dtype=np.int64)]),
+            np.concatenate([scan[1] for scan in scans] + [np.empty(0, dtype=np.int64)]),
+            np.array(title_lens, dtype=np.int64),
+            scores
+        )
+        
+        # Find the sector with highest score
+        best = scores.argmax(axis=1)
+        best_scores = scores[np.arange(n_articles), best]
+        
+        # Normalize confidence score (0-1)
+        total_scores = scores.sum(axis=1)
+        matched = total_scores > 0
+        confidences = np.where(matched, best_scores / np.where(matched, total_scores, 1.0), 0.0)
+        sector_ids = np.where(matched, best, self._sector_ids["Other"])
+        
+        return sector_ids, np.minimum(confidences, 1.0)
     
-    def _calculate_volume_score(self, articles: List[NewsArticle], total_articles: int) -> float:
-        """Calculate volume score based on article count (0 to 1)."""
-        if total_articles == 0:
-            return 0.0
-        return min(len(articles) / total_articles, 1.0)
+    def _to_soa(
+        self, articles: List[ArticleCore]
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Convert articles into parallel arrays of sentiment and relevance values.
+        
+        Returns:
+            Tuple of (sentiment_weights, has_sentiment, relevance_scores, has_relevance)
+        """
+        sentiments = np.array(
+            [self.sentiment_weights.get(article.sentiment, 0.0) for article in articles],
+            dtype=np.float64
+        )
+        has_sentiment = np.array(
+            [bool(article.sentiment) for article in articles], dtype=np.float64
+        )
+        relevance = np.array(
+            [article.relevance_score or 0.0 for article in articles], dtype=np.float64
+        )
+        has_relevance = np.array(
+            [article.relevance_score is not None for article in articles], dtype=np.float64
+        )
+        return sentiments, has_sentiment, relevance, has_relevance
     
-    def _calculate_relevance_score(self, articles: List[NewsArticle]) -> float:
-        """Calculate average relevance score for articles (0 to 1)."""
-        if not articles:
-            return 0.0
+    def _aggregate_metrics(
+        self,
+        articles: List[ArticleCore],
+        sector_ids: np.ndarray,
+        confidences: np.ndarray,
+        total_articles: int
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Calculate per-sector metrics for classified articles.
         
-        total_relevance = 0.0
-        valid_articles = 0
+        Each returned array is indexed by sector id. Sentiment is the average
+        over articles with a sentiment (-1 to 1), volume the share of all
+        articles (0 to 1), relevance the average over articles with a
+        relevance score (0 to 1) and confidence the average classification
+        confidence.
         
-        for article in articles:
-            if article.relevance_score is not None:
-                total_relevance += article.relevance_score
-                valid_articles += 1
+        Returns:
+            Tuple of (counts, sentiment_scores, volume_scores, relevance_scores, confidences)
+        """
+        n_sectors = len(self._sector_names)
+        sentiments, has_sentiment, relevance, has_relevance = self._to_soa(articles)
         
-        return total_relevance / valid_articles if valid_articles > 0 else 0.0
+        counts = np.bincount(sector_ids, minlength=n_sectors)
+        sentiment_sum = np.bincount(sector_ids, weights=sentiments, minlength=n_sectors)
+        sentiment_n = np.bincount(sector_ids, weights=has_sentiment, minlength=n_sectors)
+        relevance_sum = np.bincount(sector_ids, weights=relevance, minlength=n_sectors)
+        relevance_n = np.bincount(sector_ids, weights=has_relevance, minlength=n_sectors)
+        confidence_sum = np.bincount(sector_ids, weights=confidences, minlength=n_sectors)
+        
+        sentiment_scores = sentiment_sum / np.maximum(sentiment_n, 1)
+        relevance_scores = relevance_sum / np.maximum(relevance_n, 1)
+        volume_scores = np.minimum(counts / max(total_articles, 1), 1.0)
+        avg_confidences = confidence_sum / np.maximum(counts, 1)
+        
+        return counts, sentiment_scores, volume_scores, relevance_scores, avg_confidences
     
     async def generate_heatmap(
         self, 
-        articles: List[NewsArticle], 
-        sectors: Optional[List[str]] = None
+        articles: List[ArticleCore], 
+        sectors: Optional[List[str]] = None,
+        data_version: Optional[datetime] = None
     ) -> Dict[str, Any]:
         """
         Generate a sector-based heatmap from news articles.
@@ -173,53 +297,114 @@ class HeatmapService:
         Args:
             articles: List of news articles to analyze
             sectors: Optional list of sectors to focus on
+            data_version: Timestamp of the news data; memoized article scans
+                are discarded when it changes
         
         Returns:
             Dictionary containing heatmap data
         """
         logger.info(f"Generating heatmap for {len(articles)} articles")
         
-        # Classify articles by sector
-        sector_articles = defaultdict(list)
-        sector_confidences = defaultdict(list)
+        if self.executor is None:
+            return self._generate_heatmap(articles, sectors, data_version)
         
-        for article in articles:
-            sector, confidence = self._classify_article_sector(article)
-            
-            # Filter by requested sectors if specified
-            if sectors and sector not in sectors:
-                continue
-            
-            sector_articles[sector].append(article)
-            sector_confidences[sector].append(confidence)
+        # Classification and aggregation are CPU-bound, so run them in the
+        # process pool to keep the event loop responsive
+        article_rows = [
+            (article.id, article.title, article.description, article.sentiment, article.relevance_score)
+            for article in articles
+        ]
+        loop = asyncio.get_running_loop()
+        executor = self.executor
+        try:
+            return await loop.run_in_executor(
+                executor, _generate_heatmap_sync, article_rows, sectors, data_version
+            )
+        except BrokenProcessPool:
+            logger.warning("Heatmap process pool is broken, recreating it and retrying once")
+        
+        # Concurrent callers share the broken pool, so only the first replaces it
+        if self.executor is executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = self.executor_factory() if self.executor_factory else None
+        
+        if self.executor is None:
+            return self._generate_heatmap(articles, sectors, data_version)
+        return await loop.run_in_executor(
+            self.executor, _generate_heatmap_sync, article_rows, sectors, data_version
+        )
+    
+    def _generate_heatmap(
+        self,
+        articles: List[ArticleCore],
+        sectors: Optional[List[str]],
+        data_version: Optional[datetime]
+    ) -> Dict[str, Any]:
+        """Generate the heatmap synchronously; see generate_heatmap."""
+        if data_version != self._data_version:
+            self._scans_by_id.cache_clear()
+            self._data_version = data_version
+        
+        # Lowercase each article once for classification and keyword extraction
+        texts_lower = [
+            (article.title.lower(), article.description.lower()) for article in articles
+        ]
+        
+        # Scan each article once, then classify articles by sector
+        scans = [
+            self._scans_by_id(article.id, title, description)
+            for article, (title, description) in zip(articles, texts_lower)
+        ]
+        article_sector_ids, article_confidences = self._classify_articles(
+            scans, [len(title) for title, _ in texts_lower]
+        )
+        
+        # Filter by requested sectors if specified
+        if sectors:
+            requested_ids = [self._sector_ids[s] for s in sectors if s in self._sector_ids]
+            kept = np.flatnonzero(np.isin(article_sector_ids, requested_ids))
+        else:
+            kept = np.arange(len(articles))
+        
+        kept_articles = [articles[i] for i in kept]
+        kept_sector_ids = article_sector_ids[kept]
+        
+        # Group article ids and route scanned words by sector id, in order
+        # of first appearance
+        sector_order = []
+        sector_article_ids = [[] for _ in self._sector_names]
+        sector_word_counts = [Counter() for _ in self._sector_names]
+        for i, sector_id in zip(kept, kept_sector_ids):
+            if not sector_article_ids[sector_id]:
+                sector_order.append(sector_id)
+            sector_article_ids[sector_id].append(articles[i].id)
+            sector_word_counts[sector_id].update(scans[i][2])
+        
+        # Calculate metrics
+        total_articles = len(articles)
+        counts, sentiment_scores, volume_scores, relevance_scores, confidences = self._aggregate_metrics(
+            kept_articles, kept_sector_ids, article_confidences[kept], total_articles
+        )
         
         # Generate heatmap data for each sector
         heatmap_data = []
-        total_articles = len(articles)
         
-        for sector, sector_article_list in sector_articles.items():
-            if not sector_article_list:
-                continue
-            
-            # Calculate metrics
-            sentiment_score = self._calculate_sentiment_score(sector_article_list)
-            volume_score = self._calculate_volume_score(sector_article_list, total_articles)
-            relevance_score = self._calculate_relevance_score(sector_article_list)
-            
-            # Extract keywords
-            keywords = self._extract_keywords(sector_article_list, sector)
+        for sector_id in sector_order:
+            sentiment_score = float(sentiment_scores[sector_id])
+            volume_score = float(volume_scores[sector_id])
+            relevance_score = float(relevance_scores[sector_id])
             
-            # Calculate average confidence
-            avg_confidence = sum(sector_confidences[sector]) / len(sector_confidences[sector])
+            # Extract top keywords
+            keywords = [word for word, count in sector_word_counts[sector_id].most_common(10)]
             
             heatmap_data.append({
-                "sector": sector,
-                "count": len(sector_article_list),
+                "sector": self._sector_names[sector_id],
+                "count": int(counts[sector_id]),
                 "sentiment_score": round(sentiment_score, 3),
                 "volume_score": round(volume_score, 3),
                 "relevance_score": round(relevance_score, 3),
-                "confidence": round(avg_confidence, 3),
-                "articles": [article.id for article in sector_article_list],
+                "confidence": round(float(confidences[sector_id]), 3),
+                "articles": sector_article_ids[sector_id],
                 "keywords": keywords,
                 "color_intensity": self._calculate_color_intensity(sentiment_score, volume_score, relevance_score)
             })
@@ -10,7 +10,10 @@ from typing import List, Dict, Optional, Any
 from dataclasses import dataclass
 import time
 
-from ..models.news_models import NewsArticle, SentimentType
+import orjson
+import xxhash
+
+from ..models.news_models import ArticleCore, NewsArticle, SentimentType
 
 logger = logging.getLogger(__name__)
 
@@ -18,8 +21,11 @@ logger = logging.getLogger(__name__)
 class NewsCache:
     """Cache for news data to respect API limits."""
     data: List[Dict[str, Any]]
+    cores: List[ArticleCore]
     timestamp: datetime
+    parsed: Optional[List[NewsArticle]] = None  # Built on first get_news_data call
     query_count: int = 0
+    limit: int = 0  # Number of articles requested when the cache was filled
 
 class NewsService:
     """Service for fetching and managing financial news data."""
@@ -30,14 +36,47 @@ class NewsService:
         self.cache: Optional[NewsCache] = None
         self.cache_duration = timedelta(hours=1)  # Cache for 1 hour
         self.max_queries_per_day = 100
+        self.max_page_size = 100  # MarketAux max articles per request
+        self.max_pages = 3  # Max requests per fetch
+        self.max_articles = self.max_pages * self.max_page_size
+        self.reserved_queries = 24  # Kept for hourly cache refreshes, never spent on extra pages
+        self.max_concurrent_requests = 5
         self.daily_query_count = 0
         self.last_query_reset = datetime.now().date()
+        self._date_checked_at = time.monotonic()
+        self._date_check_interval = 60  # Seconds between date checks
+        self._session: Optional[aiohttp.ClientSession] = None
         
         if not self.api_key:
             logger.warning("MARKETAUX_API_KEY not found in environment variables")
     
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Get the shared HTTP session, creating it on first use.
+        
+        The session is bound to the event loop it was first created on, so
+        the service must be used and closed within that loop.
+        """
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=32, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=10)
+            )
+        return self._session
+    
+    async def close(self):
+        """Close the shared HTTP session."""
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+    
     def _reset_daily_count_if_needed(self):
-        """Reset daily query count if it's a new day."""
+        """Reset daily query count if it's a new day, checking the date at most once a minute."""
+        now = time.monotonic()
+        if now - self._date_checked_at <= self._date_check_interval:
+            return
+        
+        self._date_checked_at = now
         today = datetime.now().date()
         if today > self.last_query_reset:
             self.daily_query_count = 0
@@ -59,8 +98,50 @@ class NewsService:
         """Get the timestamp of the last data update."""
         return self.cache.timestamp if self.cache else None
     
-    async def _fetch_from_marketaux(self, limit: int = 50) -> List[Dict[str, Any]]:
-        """Fetch news data from MarketAux API."""
+    async def _fetch_page(
+        self,
+        session: aiohttp.ClientSession,
+        semaphore: asyncio.Semaphore,
+        url: str,
+        params: Dict[str, Any],
+        page: int
+    ) -> List[Dict[str, Any]]:
+        """Fetch a single page of news data from MarketAux API."""
+        async with semaphore:
+            try:
+                async with session.get(url, params={**params, "page": page}) as response:
+                    if response.status != 200:
+                        error_text = await response.text()
+                        logger.error(f"MarketAux API error: {response.status} - {error_text}")
+                        raise Exception(f"API request failed: {response.status}")
+                    
+                    data = orjson.loads(await response.read())
+                    
+                    if "data" not in data or not isinstance(data["data"], list):
+                        raise Exception("Invalid response format from MarketAux API")
+                    
+                    # Increment query count
+                    self.daily_query_count += 1
+                    logger.info(f"MarketAux API call successful (page {page}). Daily count: {self.daily_query_count}")
+                    
+                    return data["data"]
+                    
+            except aiohttp.ClientError as e:
+                logger.error(f"Network error fetching news: {e}")
+                raise Exception(f"Network error: {e}")
+    
+    async def _fetch_from_marketaux(self, limit: int = 50) -> tuple[List[Dict[str, Any]], bool]:
+        """
+        Fetch news data from MarketAux API.
+        
+        MarketAux returns at most 100 articles per request, so larger limits
+        are split into up to max_pages pages that are fetched concurrently.
+        Each page counts as one query against the daily limit, and pages
+        after the first never spend the queries reserved for cache refreshes.
+        
+        Returns:
+            The fetched articles, and whether every requested page was fetched
+        """
         if not self.api_key:
             raise ValueError("MarketAux API key not configured")
         
@@ -71,46 +152,70 @@ class NewsService:
         params = {
             "api_token": self.api_key,
             "language": "en",
-            "limit": min(limit, 100),  # MarketAux max is 100
+            "limit": min(limit, self.max_page_size),
             "exchanges": "NYSE,NASDAQ",
             "filter_entities": "true",
             "sentiment": "true"
         }
         
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params) as response:
-                    if response.status != 200:
-                        error_text = await response.text()
-                        logger.error(f"MarketAux API error: {response.status} - {error_text}")
-                        raise Exception(f"API request failed: {response.status}")
-                    
-                    data = await response.json()
-                    
-                    if "data" not in data or not isinstance(data["data"], list):
-                        raise Exception("Invalid response format from MarketAux API")
-                    
-                    # Increment query count
-                    self.daily_query_count += 1
-                    logger.info(f"MarketAux API call successful. Daily count: {self.daily_query_count}")
-                    
-                    return data["data"]
-                    
-        except aiohttp.ClientError as e:
-            logger.error(f"Network error fetching news: {e}")
-            raise Exception(f"Network error: {e}")
-        except Exception as e:
-            logger.error(f"Error fetching news from MarketAux: {e}")
-            raise
+        # Extra pages only use the daily budget left after the reserved queries
+        wanted_pages = min(-(-limit // self.max_page_size), self.max_pages)
+        spare_queries = self.max_queries_per_day - self.daily_query_count - self.reserved_queries
+        n_pages = max(1, min(wanted_pages, spare_queries))
+        
+        session = await self._get_session()
+        semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+        pages = await asyncio.gather(
+            *[self._fetch_page(session, semaphore, url, params, page) for page in range(1, n_pages + 1)],
+            return_exceptions=True
+        )
+        
+        errors = [page for page in pages if isinstance(page, BaseException)]
+        if len(errors) == len(pages):
+            logger.error(f"Error fetching news from MarketAux: {errors[0]}")
+            raise errors[0]
+        if errors:
+            logger.warning(f"{len(errors)} of {n_pages} MarketAux pages failed, returning partial data")
+        
+        # New articles published between page requests shift later pages,
+        # so the same article can appear on two pages
+        articles = {}
+        for page in pages:
+            if isinstance(page, BaseException):
+                continue
+            for article in page:
+                articles.setdefault(article.get("uuid") or self._fallback_article_id(article), article)
+        
+        complete = not errors and n_pages == wanted_pages
+        return list(articles.values())[:limit], complete
     
-    def _parse_news_article(self, raw_article: Dict[str, Any]) -> NewsArticle:
-        """Parse raw API response into NewsArticle model."""
-        # Map sentiment to enum
-        sentiment = None
+    def _fallback_article_id(self, raw_article: Dict[str, Any]) -> str:
+        """Derive a stable article id from title and publish time when no uuid is present."""
+        key = f"{raw_article.get('title') or ''}{raw_article.get('published_at') or ''}"
+        return xxhash.xxh64_hexdigest(key.encode())
+    
+    def _parse_sentiment(self, raw_article: Dict[str, Any]) -> Optional[SentimentType]:
+        """Map the raw sentiment string to the SentimentType enum."""
         if raw_article.get("sentiment"):
             sentiment_str = raw_article["sentiment"].lower()
             if sentiment_str in ["positive", "negative", "neutral"]:
-                sentiment = SentimentType(sentiment_str)
+                return SentimentType(sentiment_str)
+        return None
+    
+    def _parse_core(self, raw_article: Dict[str, Any]) -> ArticleCore:
+        """Parse raw API response into the lightweight ArticleCore used internally."""
+        return ArticleCore(
+            id=raw_article.get("uuid") or self._fallback_article_id(raw_article),
+            title=raw_article.get("title", ""),
+            description=raw_article.get("description", ""),
+            sentiment=self._parse_sentiment(raw_article),
+            relevance_score=raw_article.get("relevance_score")
+        )
+    
+    def _parse_news_article(self, raw_article: Dict[str, Any]) -> NewsArticle:
+        """Parse raw API response into NewsArticle model."""
+        # Map sentiment to enum
+        sentiment = self._parse_sentiment(raw_article)
         
         # Parse entities
         entities = []
@@ -123,7 +228,7 @@ class NewsService:
                 })
         
         return NewsArticle(
-            id=raw_article.get("uuid", str(hash(raw_article.get("title", "")))),
+            id=raw_article.get("uuid") or self._fallback_article_id(raw_article),
             title=raw_article.get("title", ""),
             description=raw_article.get("description", ""),
             url=raw_article.get("url", ""),
@@ -134,51 +239,81 @@ class NewsService:
             entities=entities
         )
     
-    async def get_news_data(self, limit: int = 50, force_refresh: bool = False) -> List[NewsArticle]:
+    async def _get_cache(self, limit: int, force_refresh: bool) -> NewsCache:
         """
-        Get news data, using cache if available and valid.
+        Get the news cache, refreshing it from the API when needed.
         
-        Args:
-            limit: Maximum number of articles to return
-            force_refresh: Force refresh from API even if cache is valid
-        
-        Returns:
-            List of NewsArticle objects
+        A valid cache filled with a smaller limit is refreshed so larger
+        requests (up to max_articles) get their full article count. Falls
+        back to the existing cached data if the refresh fails.
         """
+        limit = min(limit, self.max_articles)
+        
         # Check cache first
-        if not force_refresh and self._is_cache_valid():
+        if not force_refresh and self._is_cache_valid() and limit <= self.cache.limit:
             logger.info("Using cached news data")
-            cached_articles = [self._parse_news_article(article) for article in self.cache.data[:limit]]
-            return cached_articles
+            return self.cache
         
         # Fetch fresh data
         try:
             logger.info("Fetching fresh news data from MarketAux")
-            raw_data = await self._fetch_from_marketaux(limit=limit)
+            # Fetch whole pages, since a page costs one query however few articles it holds
+            fetch_limit = -(-limit // self.max_page_size) * self.max_page_size
+            raw_data, complete = await self._fetch_from_marketaux(limit=fetch_limit)
             
-            # Update cache
+            # Parse once and cache alongside the raw data
             self.cache = NewsCache(
                 data=raw_data,
+                cores=[self._parse_core(article) for article in raw_data],
                 timestamp=datetime.now(),
-                query_count=self.daily_query_count
+                query_count=self.daily_query_count,
+                # A partial fetch only covers the articles it actually returned
+                limit=fetch_limit if complete else len(raw_data)
             )
             
-            # Parse and return articles
-            articles = [self._parse_news_article(article) for article in raw_data[:limit]]
-            logger.info(f"Successfully fetched {len(articles)} news articles")
-            return articles
+            logger.info(f"Successfully fetched {len(raw_data)} news articles")
+            return self.cache
             
         except Exception as e:
             logger.error(f"Error fetching news data: {e}")
             
-            # Return cached data if available, even if expired
+            # Return cached data if available, even if expired or smaller than requested
             if self.cache and self.cache.data:
-                logger.warning("Returning expired cached data due to API error")
-                cached_articles = [self._parse_news_article(article) for article in self.cache.data[:limit]]
-                return cached_articles
+                logger.warning("Returning cached data due to API error")
+                return self.cache
             
             raise
     
+    async def get_news_data(self, limit: int = 50, force_refresh: bool = False) -> List[NewsArticle]:
+        """
+        Get news data, using cache if available and valid.
+        
+        Args:
+            limit: Maximum number of articles to return
+            force_refresh: Force refresh from API even if cache is valid
+        
+        Returns:
+            List of NewsArticle objects
+        """
+        cache = await self._get_cache(limit, force_refresh)
+        if cache.parsed is None:
+            cache.parsed = [self._parse_news_article(article) for article in cache.data]
+        return cache.parsed[:limit]
+    
+    async def get_article_cores(self, limit: int = 50, force_refresh: bool = False) -> List[ArticleCore]:
+        """
+        Get lightweight articles for internal analysis, using cache if available and valid.
+        
+        Args:
+            limit: Maximum number of articles to return
+            force_refresh: Force refresh from API even if cache is valid
+        
+        Returns:
+            List of ArticleCore objects
+        """
+        cache = await self._get_cache(limit, force_refresh)
+        return cache.cores[:limit]
+    
     def get_api_usage_info(self) -> Dict[str, Any]:
         """Get information about API usage and limits."""
         self._reset_daily_count_if_needed()
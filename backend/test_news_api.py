@@ -30,11 +30,11 @@ async def test_news_api():
     
     print("✅ API key found")
     
+    # Test news service
+    print("\n📰 Testing News Service...")
+    news_service = NewsService()
+    
     try:
-        # Test news service
-        print("\n📰 Testing News Service...")
-        news_service = NewsService()
-        
         # Get API usage info
         usage_info = news_service.get_api_usage_info()
         print(f"   Daily queries used: {usage_info['daily_queries_used']}/{usage_info['daily_queries_limit']}")
@@ -59,10 +59,11 @@ async def test_news_api():
         sectors = heatmap_service.get_available_sectors()
         print(f"   Available sectors: {', '.join(sectors)}")
         
-        # Generate heatmap
-        if articles:
+        # Generate heatmap from the lightweight articles the API uses
+        cores = await news_service.get_article_cores(limit=5)
+        if cores:
             print("\n📊 Generating heatmap...")
-            heatmap_data = await heatmap_service.generate_heatmap(articles)
+            heatmap_data = await heatmap_service.generate_heatmap(cores)
             print(f"   ✅ Generated heatmap with {len(heatmap_data['heatmap_data'])} sectors")
             
             if heatmap_data['heatmap_data']:
@@ -75,6 +76,10 @@ async def test_news_api():
     except Exception as e:
         print(f"\n❌ Test failed: {e}")
         return False
+    
+    finally:
+        # Close the shared HTTP session before the event loop shuts down
+        await news_service.close()
 
 if __name__ == "__main__":
     success = asyncio.run(test_news_api())